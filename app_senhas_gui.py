@@ -1,5 +1,4 @@
 import os
-import csv
 import string
 import secrets
 from datetime import datetime
@@ -10,32 +9,75 @@ MAX_LENGTH = 64
 DEFAULT_LENGTH = 5  # troque para 5 se quiser manter seu padrão anterior
 
 # === Funções de senha (comprimento variável) ===
-CHARSET = string.digits + string.ascii_uppercase + string.ascii_lowercase
+# CHARSET como bytes: indexar devolve o código ASCII direto (62 símbolos)
+CHARSET = (string.digits + string.ascii_uppercase + string.ascii_lowercase).encode()
 sysrand = secrets.SystemRandom()
 
+# Tabelas do bytes.translate: máscara de 6 bits, bytes descartados (6 bits
+# baixos = 62 ou 63) e índice -> caractere de CHARSET.
+_MASK6 = bytes(b & 0x3F for b in range(256))
+_REJEITA = bytes(b for b in range(256) if b & 0x3F >= len(CHARSET))
+_TABELA = CHARSET + bytes(256 - len(CHARSET))
+
+def _random_indices(n, _urandom=os.urandom):
+    """Devolve 'n' bytes uniformes em [0, 62), isto é, índices de CHARSET.
+
+    Lê os.urandom em bloco, usa os 6 bits baixos de cada byte e descarta 62/63
+    (sem viés, aceita ~97%); máscara e descarte rodam em C via bytes.translate.
+    """
+    out = _urandom(int(n * 1.05) + 8).translate(_MASK6, _REJEITA)
+    while len(out) < n:
+        out += _urandom(int((n - len(out)) * 1.05) + 8).translate(_MASK6, _REJEITA)
+    return out[:n]
+
+def _garantir_composicao(senha, _sample=sysrand.sample, _choice=sysrand.choice,
+                         _D=string.digits.encode(), _U=string.ascii_uppercase.encode(),
+                         _L=string.ascii_lowercase.encode()):
+    """Grava 1 dígito, 1 maiúscula e 1 minúscula em 3 posições sorteadas de 'senha'.
+
+    Os caracteres de 'senha' já são uniformes e independentes, então o resultado
+    tem a mesma distribuição que embaralhar os 3 obrigatórios com o restante, com
+    6 chamadas ao SystemRandom em vez de ~length. Os parâmetros com '_' são
+    apelidos locais (não passe valores).
+    """
+    out = bytearray(senha)
+    i, j, k = _sample(range(len(out)), 3)
+    out[i] = _choice(_D)
+    out[j] = _choice(_U)
+    out[k] = _choice(_L)
+    return bytes(out)
+
 def gerar_senha(length=DEFAULT_LENGTH, require_all=False):
-    """Gera uma senha de 'length' caracteres. Se require_all=True, garante A/a/0-9."""
+    """Gera uma senha (bytes ASCII) de 'length' caracteres. Se require_all=True, garante A/a/0-9."""
     if length < MIN_LENGTH or length > MAX_LENGTH:
         raise ValueError(f"Comprimento inválido. Use entre {MIN_LENGTH} e {MAX_LENGTH}.")
     if require_all and length < 3:
         raise ValueError("Para exigir composição mínima, use comprimento ≥ 3.")
 
-    if not require_all:
-        return ''.join(secrets.choice(CHARSET) for _ in range(length))
+    senha = _random_indices(length).translate(_TABELA)
+    if require_all:
+        return _garantir_composicao(senha)
+    return senha
 
-    # Garante ao menos 1 dígito, 1 maiúscula e 1 minúscula
-    partes = [
-        secrets.choice(string.digits),
-        secrets.choice(string.ascii_uppercase),
-        secrets.choice(string.ascii_lowercase),
-    ]
-    while len(partes) < length:
-        partes.append(secrets.choice(CHARSET))
-    sysrand.shuffle(partes)
-    return ''.join(partes)
+def _gerar_bloco(qtd, length):
+    """Gera 'qtd' senhas de 'length' caracteres a partir de um único sorteio em bloco."""
+    blob = _random_indices(qtd * length).translate(_TABELA)
+    return [blob[i:i + length] for i in range(0, len(blob), length)]
+
+def _gerar_bloco_composto(qtd, length):
+    """Como _gerar_bloco, mas cada senha passa por _garantir_composicao."""
+    return [_garantir_composicao(s) for s in _gerar_bloco(qtd, length)]
+
+def _indice_para_senha(n, length):
+    """Converte um inteiro em [0, 62**length) na senha correspondente em base 62."""
+    out = bytearray(length)
+    for i in range(length - 1, -1, -1):
+        n, r = divmod(n, 62)
+        out[i] = CHARSET[r]
+    return bytes(out)
 
 def gerar_lista(qtd, length=DEFAULT_LENGTH, unique=False, require_all=False):
-    """Gera 'qtd' senhas. Se unique=True, evita repetições. Respeita 'length'."""
+    """Gera 'qtd' senhas (bytes ASCII). Se unique=True, evita repetições. Respeita 'length'."""
     if qtd < 1 or qtd > 10000:
         raise ValueError("Informe um número entre 1 e 10.000.")
     if length < MIN_LENGTH or length > MAX_LENGTH:
@@ -43,21 +85,40 @@ def gerar_lista(qtd, length=DEFAULT_LENGTH, unique=False, require_all=False):
     if require_all and length < 3:
         raise ValueError("Para exigir composição mínima, use comprimento ≥ 3.")
 
+    # Validado uma vez aqui; os geradores em bloco não repetem as checagens
+    lote = _gerar_bloco_composto if require_all else _gerar_bloco
+
     if not unique:
-        return [gerar_senha(length=length, require_all=require_all) for _ in range(qtd)]
+        return lote(qtd, length)
+
+    # Com qtd ≤ 10.000, só comprimentos ≤ 2 chegam perto do limite:
+    # 62**3 = 238.328 já passa de 2 * 10.000, então nem calcula a potência.
+    if not require_all and length <= 2:
+        total = len(CHARSET) ** length
+        if qtd > total:
+            raise ValueError(f"Com comprimento {length} só existem {total} senhas diferentes.")
+        if qtd > total // 2:
+            # Espaço quase esgotado: sortear sem reposição evita as retentativas
+            # do laço abaixo (problema do colecionador de figurinhas).
+            return [_indice_para_senha(n, length) for n in sysrand.sample(range(total), qtd)]
 
+    # O set guarda só referências aos bytes (o hash de bytes fica em cache no
+    # objeto); cada rodada gera exatamente o que falta e insere tudo de uma vez.
     senhas = set()
     while len(senhas) < qtd:
-        senhas.add(gerar_senha(length=length, require_all=require_all))
+        senhas.update(lote(qtd - len(senhas), length))
     return list(senhas)
 
 def salvar_csv(caminho, senhas):
-    """Salva CSV com cabeçalho 'senha'."""
-    with open(caminho, 'w', newline='', encoding='utf-8') as f:
-        w = csv.writer(f)
-        w.writerow(['senha'])
-        for s in senhas:
-            w.writerow([s])
+    """Salva CSV com cabeçalho 'senha' a partir de senhas em bytes ASCII.
+
+    As senhas só têm letras e dígitos (nada a escapar), então o arquivo inteiro é
+    montado em memória (no máximo ~660 KB) e gravado numa única escrita, sem o
+    módulo csv, mantendo o mesmo formato (fim de linha CRLF).
+    """
+    corpo = b'\r\n'.join([b'senha', *senhas, b''])
+    with open(caminho, 'wb') as f:
+        f.write(corpo)
 
 def abrir_pasta_do_arquivo(caminho):
     """Tenta abrir a pasta do arquivo no sistema operacional."""
@@ -106,96 +167,128 @@ layout = [
     [sg.Button("Gerar", key="-GERAR-", bind_return_key=True),
      sg.Button("Salvar CSV...", key="-SALVAR-"),
      sg.Button("Abrir pasta", key="-ABRIR-"),
+     sg.Button("Copiar todas", key="-COPIA-TOD-"),
+     sg.Button("Copiar última", key="-COPIA-ULT-"),
      sg.Button("Limpar", key="-LIMPAR-"),
      sg.Button("Sair")],
     [sg.Text("Resultado:")],
-    [sg.Multiline("", size=(60,15), key="-OUT-", disabled=True, autoscroll=True, font=("Consolas", 10))]
+    [sg.Multiline("", size=(60,15), key="-OUT-", disabled=True, autoscroll=False, font=("Consolas", 10))]
 ]
 
 window = sg.Window("Gerador de Senhas", layout)
-senhas_atuais = []
-ultimo_arquivo = None
-ultimo_length = DEFAULT_LENGTH
+estado = {
+    "senhas": [],
+    "texto": "",  # estado["senhas"] já unidas por '\n' (montado uma vez, ao gerar)
+    "ultimo_arquivo": None,
+    "ultimo_length": DEFAULT_LENGTH,
+}
 
-while True:
-    event, values = window.read()
-    if event in (sg.WINDOW_CLOSED, "Sair"):
-        break
+# === Tratadores de eventos (um por botão; despachados pela tabela HANDLERS) ===
+# Cada um recebe os valores do evento e altera `estado` e `window` no módulo.
+def on_gerar(values):
+    # Valida quantidade
+    try:
+        qtd = int(str(values["-QTD-"]).strip())
+    except (ValueError, TypeError):
+        sg.popup_error("A quantidade precisa ser um número inteiro entre 1 e 10.000.")
+        return
 
-    if event == "-GERAR-":
-        # Valida quantidade
+    # Valida comprimento
+    raw_length = str(values["-LEN-"]).strip()
+    if not raw_length:
+        length = DEFAULT_LENGTH
+    else:
         try:
-            qtd = int(str(values["-QTD-"]).strip())
-        except (ValueError, TypeError):
-            sg.popup_error("A quantidade precisa ser um número inteiro entre 1 e 10.000.")
-            continue
-
-        # Valida comprimento
-        raw_length = str(values["-LEN-"]).strip()
-        if not raw_length:
-            length = DEFAULT_LENGTH
-        else:
-            try:
-                length = int(raw_length)
-            except ValueError:
-                sg.popup_error(f"O comprimento precisa ser um número inteiro entre {MIN_LENGTH} e {MAX_LENGTH}.")
-                continue
-
-        if length < MIN_LENGTH or length > MAX_LENGTH:
-            sg.popup_error(f"Comprimento inválido. Use entre {MIN_LENGTH} e {MAX_LENGTH}.")
-            continue
+            length = int(raw_length)
+        except ValueError:
+            sg.popup_error(f"O comprimento precisa ser um número inteiro entre {MIN_LENGTH} e {MAX_LENGTH}.")
+            return
 
-        try:
-            senhas_atuais = gerar_lista(
-                qtd, length=length, unique=values["-UNQ-"], require_all=values["-REQ-"]
-            )
-            ultimo_length = length
-        except Exception as e:
-            sg.popup_error(f"Erro ao gerar: {e}")
-            continue
-
-        # Exibe
-        window["-OUT-"].update("")
-        window["-OUT-"].print(f"Gerado: {len(senhas_atuais)} senhas (comprimento = {ultimo_length}).\n")
-        for s in senhas_atuais:
-            window["-OUT-"].print(s)
-        ultimo_arquivo = None
-
-    if event == "-SALVAR-":
-        if not senhas_atuais:
-            sg.popup("Nada para salvar. Gere as senhas primeiro.")
-            continue
-        nome_sugerido = f"senhas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        caminho = sg.popup_get_file(
-            "Escolha onde salvar",
-            save_as=True,
-            default_extension=".csv",
-            file_types=(("CSV", "*.csv"),),
-            default_path=nome_sugerido,
-            no_window=True
+    if length < MIN_LENGTH or length > MAX_LENGTH:
+        sg.popup_error(f"Comprimento inválido. Use entre {MIN_LENGTH} e {MAX_LENGTH}.")
+        return
+
+    try:
+        estado["senhas"] = gerar_lista(
+            qtd, length=length, unique=values["-UNQ-"], require_all=values["-REQ-"]
         )
-        if not caminho:
-            continue
+        estado["ultimo_length"] = length
+    except Exception as e:
+        sg.popup_error(f"Erro ao gerar: {e}")
+        return
+
+    # Exibe tudo numa única atualização do widget (um print por senha é lento)
+    estado["texto"] = b"\n".join(estado["senhas"]).decode('ascii')
+    cabecalho = f"Gerado: {len(estado['senhas'])} senhas (comprimento = {estado['ultimo_length']}).\n\n"
+    window["-OUT-"].update(value=cabecalho + estado["texto"])
+    window["-OUT-"].Widget.see("end")  # rola uma vez só, no fim (autoscroll desligado)
+    estado["ultimo_arquivo"] = None
+
+def on_salvar(values):
+    if not estado["senhas"]:
+        sg.popup("Nada para salvar. Gere as senhas primeiro.")
+        return
+    nome_sugerido = f"senhas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    caminho = sg.popup_get_file(
+        "Escolha onde salvar",
+        save_as=True,
+        default_extension=".csv",
+        file_types=(("CSV", "*.csv"),),
+        default_path=nome_sugerido,
+        no_window=True
+    )
+    if not caminho:
+        return
+    try:
+        salvar_csv(caminho, estado["senhas"])
+        estado["ultimo_arquivo"] = caminho
+        sg.popup(f"Arquivo salvo:\n{os.path.basename(caminho)}")
+    except Exception as e:
+        sg.popup_error(f"Erro ao salvar: {e}")
+
+def on_abrir(values):
+    if estado["ultimo_arquivo"]:
         try:
-            salvar_csv(caminho, senhas_atuais)
-            ultimo_arquivo = caminho
-            sg.popup(f"Arquivo salvo:\n{os.path.basename(caminho)}")
-        except Exception as e:
-            sg.popup_error(f"Erro ao salvar: {e}")
-
-    if event == "-ABRIR-":
-        if ultimo_arquivo:
-            try:
-                abrir_pasta_do_arquivo(ultimo_arquivo)
-            except Exception:
-                # Não interrompe a GUI se falhar ao abrir
-                pass
-        else:
-            sg.popup("Nenhum arquivo salvo ainda.")
-
-    if event == "-LIMPAR-":
-        window["-OUT-"].update("")
-        senhas_atuais = []
-        ultimo_arquivo = None
+            abrir_pasta_do_arquivo(estado["ultimo_arquivo"])
+        except Exception:
+            # Não interrompe a GUI se falhar ao abrir
+            pass
+    else:
+        sg.popup("Nenhum arquivo salvo ainda.")
+
+def on_copiar_todas(values):
+    if not estado["senhas"]:
+        sg.popup("Nada para copiar. Gere as senhas primeiro.")
+        return
+    sg.clipboard_set(estado["texto"])
+
+def on_copiar_ultima(values):
+    if not estado["senhas"]:
+        sg.popup("Nada para copiar. Gere as senhas primeiro.")
+        return
+    sg.clipboard_set(estado["senhas"][-1].decode('ascii'))
+
+def on_limpar(values):
+    window["-OUT-"].update("")
+    estado["senhas"] = []
+    estado["texto"] = ""
+    estado["ultimo_arquivo"] = None
+
+HANDLERS = {
+    "-GERAR-": on_gerar,
+    "-SALVAR-": on_salvar,
+    "-ABRIR-": on_abrir,
+    "-COPIA-TOD-": on_copiar_todas,
+    "-COPIA-ULT-": on_copiar_ultima,
+    "-LIMPAR-": on_limpar,
+}
+
+while True:
+    event, values = window.read()
+    if event in (sg.WINDOW_CLOSED, "Sair"):
+        break
+    handler = HANDLERS.get(event)
+    if handler:
+        handler(values)
 
 window.close()